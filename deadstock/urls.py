@@ -10,6 +10,7 @@ urlpatterns = [
 
     # product pages
     path('', views.product_list, name='product_list'),
+    path('api/products/', views.product_list_json, name='product_list_json'),
     path('product/<int:pk>/', views.product_detail, name='product_detail'),
     path('product/add/', views.product_create, name='product_create'),
     path('product/<int:pk>/edit/', views.product_edit, name='product_edit'),
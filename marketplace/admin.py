@@ -1,9 +1,14 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.utils.functional import SimpleLazyObject
 from django.utils.html import format_html
 from django.templatetags.static import static
 
 from .models import Company, Product, Order
 
+# resolved on first use (not at import) and reused for every row without an image
+PLACEHOLDER_URL = SimpleLazyObject(lambda: static("marketplace/images/placeholder.png"))
+
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
@@ -11,9 +16,17 @@ class CompanyAdmin(admin.ModelAdmin):
     search_fields = ("name", "email")
 
 
+class ProductChangeList(ChangeList):
+    """Changelist rows never show the description, so don't load it."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        return super().get_queryset(request, *args, **kwargs).defer("description")
+
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ("image_tag", "name", "company", "price", "created_at")
+    list_select_related = ("company",)
     list_filter = ("company",)
     search_fields = ("name", "description", "company__name")
     readonly_fields = ("image_preview",)
@@ -21,15 +34,16 @@ class ProductAdmin(admin.ModelAdmin):
     def image_tag(self, obj):
         """Small thumbnail for list display."""
         if obj and obj.image:
+            # pre-sized thumbnail; older rows without one fall back to the full image
+            src = obj.thumbnail.url if obj.thumbnail else obj.image.url
             return format_html(
                 '<img src="{}" style="width:60px;height:60px;object-fit:cover;border-radius:6px;" />',
-                obj.image.url
+                src
             )
         # fallback to a placeholder in your static files (or an external placeholder)
-        placeholder = static("marketplace/img/placeholder.png")
         return format_html(
             '<img src="{}" style="width:60px;height:60px;object-fit:cover;border-radius:6px;opacity:0.6" />',
-            placeholder
+            PLACEHOLDER_URL
         )
     image_tag.short_description = "Image"
     image_tag.allow_tags = True
@@ -41,13 +55,15 @@ class ProductAdmin(admin.ModelAdmin):
                 '<img src="{}" style="max-width:300px;display:block;margin:6px 0;border-radius:6px;" />',
                 obj.image.url
             )
-        placeholder = static("marketplace/img/placeholder.png")
         return format_html(
             '<img src="{}" style="max-width:300px;display:block;margin:6px 0;border-radius:6px;opacity:0.6" />',
-            placeholder
+            PLACEHOLDER_URL
         )
     image_preview.short_description = "Image preview"
 
+    def get_changelist(self, request, **kwargs):
+        return ProductChangeList
+
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
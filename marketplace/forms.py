@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from django.db import transaction
 from .models import Product, Company, Order
 
 # Product form (you already had this)
@@ -27,15 +28,18 @@ class SellerSignUpForm(UserCreationForm):
         # create the user first
         user = super().save(commit=False)
         user.email = self.cleaned_data["email"]
-        if commit:
-            user.save()
+        if not commit:
+            return user
+        # user + company are one unit: a single commit, and no orphan user if the company insert fails
+        with transaction.atomic():
+            user.save(force_insert=True)
             # then create the company linked to this user
-            Company.objects.create(
+            Company(
                 user=user,
                 name=self.cleaned_data["company_name"],
                 email=self.cleaned_data["email"],
                 website=self.cleaned_data.get("website") or ""
-            )
+            ).save(force_insert=True)
         return user
     
 
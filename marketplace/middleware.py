@@ -0,0 +1,25 @@
+from django.utils.functional import SimpleLazyObject
+
+from .models import Company
+
+
+def get_user_company(request):
+    if not request.user.is_authenticated:
+        return None
+    return Company.objects.filter(user_id=request.user.pk).only("id", "name", "email").first()
+
+
+class UserCompanyMiddleware:
+    """
+    Attach the logged-in seller's Company as request.user_company (None for
+    anonymous users and non-sellers). The lookup is lazy: it runs at most once
+    per request, and only if something reads it. Must come after
+    AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user_company = SimpleLazyObject(lambda: get_user_company(request))
+        return self.get_response(request)
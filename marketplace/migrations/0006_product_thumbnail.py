@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0005_order_commission_order_total_price_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='product_images/thumbs/'),
+        ),
+    ]
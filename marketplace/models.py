@@ -1,6 +1,14 @@
+import os
+from io import BytesIO
+
 from django.db import models
 from django.conf import settings
+from django.core.files.base import ContentFile
 from decimal import Decimal
+from PIL import Image, ImageOps
+
+# platform cut, read once at import so Order.save() doesn't convert it on every write
+COMMISSION_RATE = Decimal(getattr(settings, "COMMISSION_RATE", "0.10"))
 
 
 class Company(models.Model):
@@ -24,16 +32,79 @@ class Company(models.Model):
 
 
 class Product(models.Model):
-    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="products")
+    # indexed by the (company, -created_at) composite in Meta instead of its own index
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="products", db_index=False)
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image = models.ImageField(upload_to="product_images/", blank=True, null=True)
+    # small pre-sized copy of `image` for list/admin thumbnails, rebuilt whenever the image changes
+    thumbnail = models.ImageField(upload_to="product_images/thumbs/", blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    THUMBNAIL_SIZE = (120, 120)  # shown at 60x60, doubled for high-DPI screens
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._orig_image = self._image_name()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "image" not in update_fields:
+            # the image column isn't being written, so the thumbnail must not change either
+            super().save(*args, **kwargs)
+            return
+
+        current = self._image_name()
+        old_thumbnail = None
+        # new rows count as changed too: an image passed to the constructor is already the "original"
+        if current != self._orig_image or (self._state.adding and current):
+            old_thumbnail = self.thumbnail.name or None
+            self._build_thumbnail()
+            if update_fields is not None and "thumbnail" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "thumbnail"]
+        super().save(*args, **kwargs)
+        self._orig_image = self._image_name()
+
+        # the previous thumbnail is no longer referenced by any row
+        if old_thumbnail and old_thumbnail != self.thumbnail.name:
+            self.thumbnail.storage.delete(old_thumbnail)
+
+    def _image_name(self):
+        # don't let .only()/.defer() querysets pay an extra query just to track the image
+        if "image" in self.get_deferred_fields():
+            return getattr(self, "_orig_image", None)
+        return self.image.name if self.image else None
+
+    def _build_thumbnail(self):
+        if not self.image:
+            self.thumbnail = None
+            return
+        with Image.open(self.image) as img:
+            # honour the camera's orientation tag, or phone photos come out sideways
+            img = ImageOps.exif_transpose(img)
+            if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+                # JPEG has no alpha: composite onto white instead of exposing hidden pixel colours
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, "white")
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            thumb = ImageOps.fit(img.convert("RGB"), self.THUMBNAIL_SIZE)
+        self.image.seek(0)
+        buf = BytesIO()
+        thumb.save(buf, format="JPEG", quality=80)
+        stem = os.path.splitext(os.path.basename(self.image.name))[0]
+        self.thumbnail.save(f"{stem}_thumb.jpg", ContentFile(buf.getvalue()), save=False)
+
     def __str__(self):
         return self.name
 
+    class Meta:
+        indexes = [
+            # product_list and seller_dashboard sort newest first
+            models.Index(fields=["-created_at"]),
+            models.Index(fields=["company", "-created_at"]),
+        ]
+
 
 class Order(models.Model):
     STATUS_CHOICES = [
@@ -44,7 +115,8 @@ class Order(models.Model):
         ("cancelled", "Cancelled"),
     ]
 
-    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="orders")
+    # indexed by the (product, -created_at) composite in Meta instead of its own index
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="orders", db_index=False)
     buyer_name = models.CharField(max_length=200)
     buyer_email = models.EmailField()
     quantity = models.PositiveIntegerField(default=1)
@@ -54,15 +126,45 @@ class Order(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # remember what the totals were last computed from; read __dict__ directly so
+        # deferred fields stay unloaded (None there means "unknown", treated as changed)
+        self._orig_quantity = self.__dict__.get("quantity")
+        self._orig_product_id = self.__dict__.get("product_id")
+
     def save(self, *args, **kwargs):
+        # totals only depend on product + quantity; skip the work if neither changed
+        if (
+            self.pk
+            and self._orig_quantity is not None
+            and self._orig_product_id is not None
+            and self.quantity == self._orig_quantity
+            and self.product_id == self._orig_product_id
+        ):
+            super().save(*args, **kwargs)
+            return
+
         # calculate totals and commission
-        self.total_price = self.product.price * self.quantity
-        commission_rate = getattr(settings, "COMMISSION_RATE", Decimal("0.10"))
-        self.commission = self.total_price * Decimal(commission_rate)
+        if Order.product.is_cached(self):
+            price = self.product.price
+        else:
+            price = Product.objects.only("price").get(pk=self.product_id).price
+        self.total_price = price * self.quantity
+        self.commission = self.total_price * COMMISSION_RATE
         super().save(*args, **kwargs)
+        self._orig_quantity = self.quantity
+        self._orig_product_id = self.product_id
 
     def seller_earnings(self):
         return self.total_price - self.commission
 
     def __str__(self):
         return f"Order #{self.pk} - {self.product.name}"
+
+    class Meta:
+        indexes = [
+            # seller_orders (by product) and the admin status filter, newest first
+            models.Index(fields=["product", "-created_at"]),
+            models.Index(fields=["status", "-created_at"]),
+        ]
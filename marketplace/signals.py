@@ -0,0 +1,29 @@
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Product, Company
+
+# bumped on every catalog change; part of the product_list fragment cache key
+CATALOG_VERSION_KEY = "marketplace:catalog_version"
+
+
+def catalog_version():
+    """
+    Current catalog version (created on first use), or None when the cache is
+    per-process: another worker's bump would never be seen, so don't cache then.
+    """
+    if isinstance(caches["default"], (LocMemCache, DummyCache)):
+        return None
+    return cache.get_or_set(CATALOG_VERSION_KEY, time.time_ns, None)
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Company)
+def bump_catalog_version(sender, **kwargs):
+    """Product cards show product and company data, so either changing invalidates them."""
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
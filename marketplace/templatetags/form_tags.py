@@ -6,5 +6,10 @@ register = template.Library()
 def add_class(field, css_class):
     """
     Usage: {{ field|add_class:"form-control" }}
+    Keeps the widget's own attrs and merges css_class into any existing classes.
     """
-    return field.as_widget(attrs={"class": css_class})
+    attrs = field.field.widget.attrs
+    classes = attrs.get("class", "").split()
+    if css_class not in classes:
+        classes.append(css_class)
+    return field.as_widget(attrs={**attrs, "class": " ".join(classes)})
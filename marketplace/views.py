@@ -1,4 +1,5 @@
 import logging
+import threading
 
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
@@ -7,24 +8,69 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.core.exceptions import PermissionDenied
 from django.contrib import messages
 from django.conf import settings
-from django.template.loader import render_to_string
-from django.core.mail import EmailMultiAlternatives
+from django.template.loader import get_template
+from django.core.paginator import Paginator
+from django.core.files.storage import default_storage
+from django.http import JsonResponse
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections
+from django.db.models import Count, Q, Sum
 
 from .models import Product, Company, Order
 from .forms import ProductForm, SellerSignUpForm, OrderForm
+from .signals import catalog_version
 
 logger = logging.getLogger(__name__)
 
+PRODUCTS_PER_PAGE = 24
+# columns the product cards actually render; skips the description TextField on list pages
+PRODUCT_CARD_FIELDS = ("id", "name", "price", "image", "created_at")
+
 
 def product_list(request):
-    """Homepage: list all products (public)."""
-    products = Product.objects.all().order_by("-created_at")
-    return render(request, "marketplace/product_list.html", {"products": products})
+    """Homepage: list products, newest first, a page at a time (public)."""
+    queryset = (
+        Product.objects.select_related("company")
+        .only(*PRODUCT_CARD_FIELDS, "company__name")
+        .order_by("-created_at")
+    )
+    paginator = Paginator(queryset, PRODUCTS_PER_PAGE)
+    products = paginator.get_page(request.GET.get("page"))
+    # with a shared cache the product grid is fragment-cached per page until the catalog changes
+    return render(request, "marketplace/product_list.html", {
+        "products": products,
+        "catalog_version": catalog_version(),
+    })
+
+
+def product_list_json(request):
+    """
+    JSON version of the product list, same ordering and pages (public).
+    Uses .values() so rows come back as dicts without building Product instances.
+    """
+    rows = Product.objects.values("id", "name", "price", "image", "company__name").order_by("-created_at")
+    page = Paginator(rows, PRODUCTS_PER_PAGE).get_page(request.GET.get("page"))
+    results = [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "price": row["price"],
+            "image": default_storage.url(row["image"]) if row["image"] else None,
+            "company": row["company__name"],
+        }
+        for row in page
+    ]
+    return JsonResponse({
+        "results": results,
+        "page": page.number,
+        "num_pages": page.paginator.num_pages,
+        "has_next": page.has_next(),
+    })
 
 
 def product_detail(request, pk):
     """Show product details (public)."""
-    product = get_object_or_404(Product, pk=pk)
+    product = get_object_or_404(Product.objects.select_related("company"), pk=pk)
     return render(request, "marketplace/product_detail.html", {"product": product})
 
 
@@ -32,9 +78,9 @@ def product_detail(request, pk):
 def product_create(request):
     """
     Create a new product. Only allowed for logged-in sellers (users with a linked Company).
-    Product.company is set automatically from request.user.company.
+    Product.company is set automatically from request.user_company.
     """
-    company = getattr(request.user, "company", None)
+    company = request.user_company
     if not company:
         messages.error(request, "You must complete seller signup before adding products.")
         return redirect("seller_signup")
@@ -59,7 +105,8 @@ def product_edit(request, pk):
     product = get_object_or_404(Product, pk=pk)
 
     # Permission check: logged-in user must own the product's company
-    if not hasattr(request.user, "company") or request.user.company != product.company:
+    company = request.user_company
+    if not company or company.pk != product.company_id:
         raise PermissionDenied()
 
     if request.method == "POST":
@@ -82,7 +129,8 @@ def product_delete(request, pk):
     """
     product = get_object_or_404(Product, pk=pk)
 
-    if not hasattr(request.user, "company") or request.user.company != product.company:
+    company = request.user_company
+    if not company or company.pk != product.company_id:
         raise PermissionDenied()
 
     if request.method == "POST":
@@ -115,19 +163,27 @@ def seller_signup(request):
 @login_required
 def seller_dashboard(request):
     """Seller dashboard: show products for the logged-in seller's company."""
-    company = getattr(request.user, "company", None)
+    company = request.user_company
     if not company:
         messages.info(request, "Please complete seller signup to manage your products.")
         return redirect("seller_signup")
 
-    products = company.products.all().order_by("-created_at")
+    products = (
+        company.products.only(*PRODUCT_CARD_FIELDS, "company")
+        .annotate(
+            # cancelled orders earn the seller nothing, so they count towards neither figure
+            order_count=Count("orders", filter=~Q(orders__status="cancelled")),
+            revenue=Sum("orders__total_price", filter=~Q(orders__status="cancelled")),
+        )
+        .order_by("-created_at")
+    )
     return render(request, "marketplace/seller_dashboard.html", {"products": products})
 
 
 @login_required
 def seller_orders(request):
     """List orders for products belonging to the logged-in seller's company."""
-    company = getattr(request.user, "company", None)
+    company = request.user_company
     if not company:
         messages.info(request, "Please complete seller signup to view your orders.")
         return redirect("seller_signup")
@@ -139,7 +195,7 @@ def seller_orders(request):
 def _send_order_emails(order):
     """
     Helper to send seller & admin emails for a newly created order.
-    Uses HTML + text templates and EmailMultiAlternatives.
+    Uses HTML + text templates and EmailMultiAlternatives; both messages share one connection.
     """
     product = order.product
     company = product.company
@@ -147,51 +203,92 @@ def _send_order_emails(order):
 
     # Context for templates
     context = {"company": company, "product": product, "order": order}
+    outgoing = []
 
     # SELLER: send multipart email if company has an email
     if company and company.email:
         subject_seller = f"New order for your product: {product.name}"
-        text_seller = render_to_string("emails/order_seller.txt", context)
-        html_seller = render_to_string("emails/order_seller.html", context)
+        text_seller = get_template("emails/order_seller.txt").render(context)
+        html_seller = get_template("emails/order_seller.html").render(context)
 
         msg = EmailMultiAlternatives(subject_seller, text_seller, settings.DEFAULT_FROM_EMAIL, [company.email])
         msg.attach_alternative(html_seller, "text/html")
-        msg.send(fail_silently=False)
+        outgoing.append(msg)
 
     # ADMIN: notify admins
     if admin_emails:
         admin_context = {**context, "admin_url": f"/admin/marketplace/order/{order.pk}/change/"}
         subject_admin = f"New order placed — {product.name} (Order #{order.pk})"
-        text_admin = render_to_string("emails/order_admin.txt", admin_context)
-        html_admin = render_to_string("emails/order_admin.html", admin_context)
+        text_admin = get_template("emails/order_admin.txt").render(admin_context)
+        html_admin = get_template("emails/order_admin.html").render(admin_context)
 
         msg_admin = EmailMultiAlternatives(subject_admin, text_admin, settings.DEFAULT_FROM_EMAIL, admin_emails)
         msg_admin.attach_alternative(html_admin, "text/html")
-        msg_admin.send(fail_silently=False)
+        outgoing.append(msg_admin)
+
+    if outgoing:
+        # one SMTP connection (single handshake) for all notifications
+        with get_connection(fail_silently=False) as connection:
+            connection.send_messages(outgoing)
+
+
+def _send_order_emails_in_background(order):
+    """
+    Send the order emails on a daemon thread so the buyer doesn't wait on SMTP.
+    Failures can't reach the response anymore, so they are only logged.
+    """
+    def _run():
+        try:
+            _send_order_emails(order)
+        except Exception:
+            logger.exception("Failed to send order emails for order #%s", order.pk)
+        finally:
+            # the thread opened its own DB connection; don't leak it
+            connections.close_all()
 
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    return thread
 
+
+@login_required
 def order_create(request, pk):
     """
-    Create an Order for the given product. Public (no login needed).
+    Buyer places an order for a product.
     On success: save order, send emails (seller + admin), show success message and redirect to detail.
     """
-    product = get_object_or_404(Product, pk=pk)
+    # the buy path only needs the price, plus what the notification emails render
+    product = get_object_or_404(
+        Product.objects.select_related("company").only(
+            "id", "name", "price", "company__name", "company__email"
+        ),
+        pk=pk,
+    )
 
     if request.method == "POST":
         form = OrderForm(request.POST)
         if form.is_valid():
             order = form.save(commit=False)
             order.product = product
-            order.save()
+            order.save()  # commission + totals auto-calculated in Order.save()
 
-            # Try to send notification emails, but if they fail, log and show clear message
-            try:
-                _send_order_emails(order)
-            except Exception as e:
-                logger.exception("Failed to send order emails")
-                messages.warning(request, f"Order created but sending notification failed: {e}")
-            else:
-                messages.success(request, f"✅ Order placed. We will contact you at {order.buyer_email}")
+            # notification emails go out in the background; failures are logged there
+            _send_order_emails_in_background(order)
+
+            # build the message visible to all users (always includes total)
+            total_str = format(order.total_price, ".2f")
+            base_msg = f"Order placed successfully! Total: ₹{total_str}."
+
+            # only add commission/earnings info for staff/superusers
+            if request.user.is_staff or request.user.is_superuser:
+                commission_str = format(order.commission, ".2f")
+                earnings_str = format(order.seller_earnings(), ".2f")
+                base_msg = (
+                    f"Order placed successfully! Total: ₹{total_str}, "
+                    f"Our cut: ₹{commission_str}, Seller earnings: ₹{earnings_str}."
+                )
+
+            messages.success(request, base_msg)
 
             return redirect("product_detail", pk=product.pk)
     else:
@@ -229,47 +326,3 @@ def company_delete_confirm_staff(request, pk):
         return redirect("product_list")
 
     return render(request, "marketplace/company_confirm_delete.html", {"company": company})
-
-
-from django.shortcuts import render, get_object_or_404, redirect
-from django.contrib import messages
-from django.contrib.auth.decorators import login_required
-
-# make sure these imports exist in the file
-from .models import Product, Order
-from .forms import OrderForm
-
-
-@login_required
-def order_create(request, pk):
-    """Buyer places an order for a product"""
-    product = get_object_or_404(Product, pk=pk)
-
-    if request.method == "POST":
-        form = OrderForm(request.POST)
-        if form.is_valid():
-            order = form.save(commit=False)
-            order.product = product
-            order.save()  # commission + totals auto-calculated in Order.save()
-
-            # build the message visible to all users (always includes total)
-            total_str = format(order.total_price, ".2f")
-            base_msg = f"Order placed successfully! Total: ₹{total_str}."
-
-            # only add commission/earnings info for staff/superusers
-            if request.user.is_staff or request.user.is_superuser:
-                commission_str = format(order.commission, ".2f")
-                earnings_str = format(order.seller_earnings(), ".2f")
-                base_msg = (
-                    f"Order placed successfully! Total: ₹{total_str}, "
-                    f"Our cut: ₹{commission_str}, Seller earnings: ₹{earnings_str}."
-                )
-
-            messages.success(request, base_msg)
-
-            return redirect("product_detail", pk=product.pk)
-    else:
-        form = OrderForm()
-
-    return render(request, "marketplace/order_form.html", {"form": form, "product": product})
-